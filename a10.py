@@ -1,29 +1,79 @@
-import re, string
+import re, string, os, time, gzip, zlib, hashlib, functools, pickle, tempfile
 from wikipedia import WikipediaPage
 import wikipedia
 from bs4 import BeautifulSoup
+try:
+    # selectolax is optional; its Lexbor backend is used (the Modest one is removed in 1.0)
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # without selectolax, tables are read with BeautifulSoup
+    LexborHTMLParser = None
 from match import match
 from typing import List, Callable, Tuple, Any, Match
 
 # ------------- Fetch and parse Lamborghini data from Wikipedia ------------------
 
+# Fetched pages are cached on disk so later runs skip the network round-trip
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "lambo_bot")
+CACHE_MAX_AGE = 7 * 24 * 60 * 60  # seconds before a cached page is refetched
+
+def _cache_path(title: str) -> str:
+    return os.path.join(CACHE_DIR, hashlib.sha1(title.encode()).hexdigest() + ".html.gz")
+
+def _is_fresh(path: str) -> bool:
+    try:
+        return time.time() - os.path.getmtime(path) < CACHE_MAX_AGE
+    except OSError:
+        return False  # missing, or removed since we last looked
+
+def _write_cache_file(path: str, data: bytes) -> None:
+    # Write gzipped data to a temp file and rename it into place, so an
+    # interrupted run never leaves a truncated file at the cache path
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(data))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError:
+        pass  # caching is best effort
+
+@functools.lru_cache(maxsize=32)
 def get_page_html(title: str) -> str:
+    path = _cache_path(title)
+    if _is_fresh(path):
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return f.read()
+        except (OSError, EOFError, zlib.error, UnicodeDecodeError):
+            pass  # unreadable cache file, fall back to fetching
+    print(f"Fetching '{title}' from Wikipedia, please wait...")
     results = wikipedia.search(title)
     if not results:
         raise LookupError(f"No Wikipedia page found for {title}")
-    return WikipediaPage(results[0]).html()
+    html = WikipediaPage(results[0]).html()
+    _write_cache_file(path, html.encode("utf-8"))
+    return html
 
 def get_first_infobox_text(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml")
     results = soup.find_all(class_="infobox")
     if not results:
         raise LookupError("Page has no infobox")
     return results[0].text
 
+# Matches any character outside string.printable (non-ASCII and control characters)
+NON_PRINTABLE_RE = re.compile(f"[^{re.escape(string.printable)}]")
+MULTI_SPACE_RE = re.compile(" +")
+MULTI_NEWLINE_RE = re.compile("\n+")
+
 def clean_text(text: str) -> str:
-    only_ascii = "".join([char if char in string.printable else " " for char in text])
-    no_dup_spaces = re.sub(" +", " ", only_ascii)
-    no_dup_newlines = re.sub("\n+", "\n", no_dup_spaces)
+    only_ascii = NON_PRINTABLE_RE.sub(" ", text)
+    no_dup_spaces = MULTI_SPACE_RE.sub(" ", only_ascii)
+    no_dup_newlines = MULTI_NEWLINE_RE.sub("\n", no_dup_spaces)
     return no_dup_newlines.strip()
 
 def get_match(text: str, pattern: str, error_text: str = "Property not found") -> Match:
@@ -33,22 +83,54 @@ def get_match(text: str, pattern: str, error_text: str = "Property not found") -
         raise AttributeError(error_text)
     return match_obj
 
-# Fetch and parse Lamborghini automobiles list page once, store info here
-print("Fetching Lamborghini model data from Wikipedia, please wait...")
-html = get_page_html("List of Lamborghini automobiles")
-soup = BeautifulSoup(html, "html.parser")
-
 # The data is in tables — we'll parse the "Former production vehicles" table and others
 # We'll extract Model, Production Duration, Engine, Top Speed for each model listed
 
-def parse_lambo_tables(soup):
-    model_data = {}
+# Model cells can list several variants separated by commas or slashes
+MODEL_SPLIT_RE = re.compile(r",|/")
+
+def lexbor_text(node, separator: str = "") -> str:
+    # Join the node's stripped, non-empty text pieces the way bs4's get_text(strip=True)
+    # does; Lexbor's own text(strip=True) still adds separators for whitespace-only pieces
+    pieces = (n.text(deep=False, strip=True) for n in node.traverse(include_text=True) if n.tag == "-text")
+    return separator.join(t for t in pieces if t)
+
+def read_wikitables_selectolax(html: str) -> List[Tuple[List[str], List[List[str]]]]:
+    tables = []
     # The tables of interest have class "wikitable"
-    tables = soup.find_all("table", {"class": "wikitable"})
-    # We'll parse each table row (skip header)
-    for table in tables:
+    for table in LexborHTMLParser(html).css("table.wikitable"):
+        rows = table.css("tr")
+        if not rows:
+            continue
+        headers = [lexbor_text(th).lower() for th in rows[0].css("th")]
+        # Walk the row's direct children so td and th cells stay in document order
+        # (cells of tables nested inside a cell are not counted as columns)
+        cells = [[lexbor_text(col, " ") for col in row.iter() if col.tag in ("td", "th")]
+                 for row in rows[1:]]
+        tables.append((headers, cells))
+    return tables
+
+def read_wikitables_bs4(html: str) -> List[Tuple[List[str], List[List[str]]]]:
+    tables = []
+    for table in BeautifulSoup(html, "lxml").find_all("table", {"class": "wikitable"}):
         rows = table.find_all("tr")
+        if not rows:
+            continue
         headers = [th.get_text(strip=True).lower() for th in rows[0].find_all("th")]
+        # Only the row's own cells, matching the selectolax reader
+        cells = [[col.get_text(separator=" ", strip=True) for col in row.find_all(["td","th"], recursive=False)]
+                 for row in rows[1:]]
+        tables.append((headers, cells))
+    return tables
+
+def parse_lambo_tables(html: str) -> dict:
+    model_data = {}
+    # selectolax is much faster; BeautifulSoup covers a missing install or HTML it can't handle
+    tables = read_wikitables_selectolax(html) if LexborHTMLParser is not None else []
+    if not tables:
+        tables = read_wikitables_bs4(html)
+    # We'll parse each table row (header already split off)
+    for headers, rows in tables:
         # We want columns like model, duration of production, engine, top speed
         # Find indexes for those columns (some tables have slightly different headers)
         try:
@@ -58,20 +140,21 @@ def parse_lambo_tables(soup):
             top_speed_idx = headers.index("top speed")
         except ValueError:
             continue  # skip tables that don't have these headers
-        
-        for row in rows[1:]:
-            cols = row.find_all(["td","th"])
-            if len(cols) < max(model_idx, duration_idx, engine_idx, top_speed_idx) + 1:
+        num_cols = max(model_idx, duration_idx, engine_idx, top_speed_idx) + 1
+
+        for cols in rows:
+            if len(cols) < num_cols:
                 continue
-            # Extract text for each column
-            model_raw = cols[model_idx].get_text(separator=" ", strip=True)
-            duration = cols[duration_idx].get_text(separator=" ", strip=True)
-            engine = cols[engine_idx].get_text(separator=" ", strip=True)
-            top_speed = cols[top_speed_idx].get_text(separator=" ", strip=True)
+            model_raw = cols[model_idx]
+            duration = cols[duration_idx]
+            engine = cols[engine_idx]
+            top_speed = cols[top_speed_idx]
 
             # Models can be comma separated or have multiple variants in the cell
-            models = [m.strip() for m in re.split(r",|/", model_raw)]
-            for m in models:
+            for m in MODEL_SPLIT_RE.split(model_raw):
+                m = m.strip()
+                if not m:
+                    continue
                 key = m.lower()
                 model_data[key] = {
                     "model": m,
@@ -81,73 +164,92 @@ def parse_lambo_tables(soup):
                 }
     return model_data
 
-model_info = parse_lambo_tables(soup)
-
-if not model_info:
-    print("Warning: No Lamborghini model data found!")
+# The parsed model table is cached too, so a fresh cache skips fetching and parsing.
+# Bump the version whenever parsing changes so stale pickles are not reused.
+MODEL_INFO_CACHE_VERSION = 3
+MODEL_INFO_CACHE = os.path.join(CACHE_DIR, f"model_info.v{MODEL_INFO_CACHE_VERSION}.pickle.gz")
 
-# Print some models to help user get started
-sample_models = list(model_info.keys())[:3]
-print("Data loaded successfully.")
-print("Some Lamborghini models you can ask about:", ", ".join([model_info[m]["model"] for m in sample_models]))
+def read_model_info_cache() -> dict:
+    if not _is_fresh(MODEL_INFO_CACHE):
+        return {}
+    try:
+        with gzip.open(MODEL_INFO_CACHE, "rb") as f:
+            model_data = pickle.load(f)
+    except Exception:
+        return {}  # caching is best effort: any unreadable cache file means refetching
+    return model_data if isinstance(model_data, dict) else {}
+
+def write_model_info_cache(model_data: dict) -> None:
+    _write_cache_file(MODEL_INFO_CACHE, pickle.dumps(model_data))
+
+# Fetch and parse Lamborghini automobiles list page on first use, then reuse it.
+# An empty result is kept too: the page is cached, so retrying would parse it the same way.
+@functools.lru_cache(maxsize=1)
+def load_model_info() -> dict:
+    model_info = read_model_info_cache()
+    if not model_info:
+        try:
+            html = get_page_html("List of Lamborghini automobiles")
+        except LookupError:
+            return {}
+        model_info = parse_lambo_tables(html)
+        if model_info:
+            write_model_info_cache(model_info)
+    return model_info
 
 # ----------------- Helper functions to retrieve info --------------------
+# Model names arrive already lowercased by query_loop, matching model_info's keys
 
-def get_duration(model_name: str) -> str:
-    key = model_name.lower()
-    if key in model_info:
-        return model_info[key]["duration"]
+def get_model(model_name: str, property_name: str) -> dict:
+    model_info = load_model_info()
+    if model_name in model_info:
+        return model_info[model_name]
     else:
-        raise AttributeError(f"No production duration info for model '{model_name}'")
+        raise AttributeError(f"No {property_name} info for model '{model_name}'")
+
+def get_duration(model_name: str) -> str:
+    return get_model(model_name, "production duration")["duration"]
 
 def get_engine(model_name: str) -> str:
-    key = model_name.lower()
-    if key in model_info:
-        return model_info[key]["engine"]
-    else:
-        raise AttributeError(f"No engine info for model '{model_name}'")
+    return get_model(model_name, "engine")["engine"]
 
 def get_top_speed(model_name: str) -> str:
-    key = model_name.lower()
-    if key in model_info:
-        return model_info[key]["top_speed"]
-    else:
-        raise AttributeError(f"No top speed info for model '{model_name}'")
+    return get_model(model_name, "top speed")["top_speed"]
 
 # ----------------- Action functions --------------------
 
 def duration_action(matches: List[str]) -> List[str]:
     model = " ".join(matches)
     try:
-        duration = get_duration(model)
-        return [f"The production duration of {model.title()} is: {duration}"]
+        info = get_model(model, "production duration")
+        return [f"The production duration of {info['model']} is: {info['duration']}"]
     except AttributeError as e:
         return [str(e)]
 
 def engine_action(matches: List[str]) -> List[str]:
     model = " ".join(matches)
     try:
-        engine = get_engine(model)
-        return [f"The engine type of {model.title()} is: {engine}"]
+        info = get_model(model, "engine")
+        return [f"The engine type of {info['model']} is: {info['engine']}"]
     except AttributeError as e:
         return [str(e)]
 
 def top_speed_action(matches: List[str]) -> List[str]:
     model = " ".join(matches)
     try:
-        top_speed = get_top_speed(model)
-        return [f"The top speed of {model.title()} is: {top_speed}"]
+        info = get_model(model, "top speed")
+        return [f"The top speed of {info['model']} is: {info['top_speed']}"]
     except AttributeError as e:
         return [str(e)]
 
 def model_help_action(matches: List[str]) -> List[str]:
+    model_info = load_model_info()
     model = " ".join(matches)
     # Just give user a nudge on what they can ask about this model
-    key = model.lower()
-    if key in model_info:
-        return [f"Ask me about the production duration, engine type, or top speed of {model.title()}."]
+    if model in model_info:
+        return [f"Ask me about the production duration, engine type, or top speed of {model_info[model]['model']}."]
     else:
-        return [f"No information found for model '{model.title()}'. Try another Lamborghini model."]
+        return [f"No information found for model '{model}'. Try another Lamborghini model."]
 
 def bye_action(dummy: List[str]) -> None:
     raise KeyboardInterrupt
@@ -195,6 +297,15 @@ def search_pa_list(src: List[str]) -> List[str]:
     return ["I don't understand. Try asking about production duration, engine type, or top speed of a Lamborghini model."]
 
 def query_loop() -> None:
+    model_info = load_model_info()
+    if not model_info:
+        print("Warning: No Lamborghini model data found!")
+    else:
+        # Print some models to help user get started
+        sample_models = list(model_info.keys())[:3]
+        print("Data loaded successfully.")
+        print("Some Lamborghini models you can ask about:", ", ".join([model_info[m]["model"] for m in sample_models]))
+
     print("\nWelcome to the Lamborghini info chatbot!\n")
     print("Ask about production duration, engine type, or top speed of a Lamborghini model.")
     print("Type 'bye' to exit.\n")
@@ -0,0 +1,57 @@
+import pytest
+
+import a10
+
+# Wikipedia list tables often mark the model cell as a row header (th), indent
+# their markup and split cell text across several links and footnotes
+WIKITABLE_HTML = """
+<table class="wikitable">
+  <tr>
+    <th>Model</th>
+    <th>Duration of production</th>
+    <th>Engine</th>
+    <th>Top speed</th>
+  </tr>
+  <tr>
+    <th scope="row">Miura </th>
+    <td>1966-1973</td>
+    <td>V12</td>
+    <td>280 km/h<sup>[2]</sup> (174 mph)</td>
+  </tr>
+  <tr>
+    <td>
+      <a href="/wiki/Countach">Countach</a> <a href="/wiki/LP400">LP400</a>
+    </td>
+    <td>1974-1990</td>
+    <td>V12</td>
+    <td>295 km/h</td>
+  </tr>
+</table>
+"""
+
+
+def test_readers_agree_on_wikipedia_markup():
+    pytest.importorskip("selectolax")
+    selectolax_tables = a10.read_wikitables_selectolax(WIKITABLE_HTML)
+    assert selectolax_tables == a10.read_wikitables_bs4(WIKITABLE_HTML)
+    assert selectolax_tables[0][1] == [
+        ["Miura", "1966-1973", "V12", "280 km/h [2] (174 mph)"],
+        ["Countach LP400", "1974-1990", "V12", "295 km/h"],
+    ]
+
+
+def test_parse_lambo_tables_reads_row_header_model():
+    model_data = a10.parse_lambo_tables(WIKITABLE_HTML)
+    assert model_data["miura"] == {
+        "model": "Miura",
+        "duration": "1966-1973",
+        "engine": "V12",
+        "top_speed": "280 km/h [2] (174 mph)",
+    }
+
+
+def test_query_for_multi_link_model(monkeypatch):
+    monkeypatch.setattr(a10, "load_model_info", lambda: a10.parse_lambo_tables(WIKITABLE_HTML))
+    assert a10.search_pa_list("top speed of countach lp400".split()) == [
+        "The top speed of Countach LP400 is: 295 km/h"
+    ]